@@ -0,0 +1,99 @@
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+# Sized to comfortably cover the active-user population; entries are ~100
+# bytes each so the worst case stays in the low megabytes.
+TOKEN_CACHE_MAXSIZE = 10_000
+TOKEN_CACHE_TTL = 60
+USER_CACHE_TTL = 60
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWT authentication with an in-process LRU+TTL verification cache.
+
+    Stock JWTAuthentication re-parses the token, re-verifies the signature
+    and reloads the user from the database on every request, which is all
+    repeat work for a caller holding a valid token. Cache the outcome keyed
+    on a digest of the raw token; a hit skips both the signature check and
+    the user lookup. Entries live for at most TOKEN_CACHE_TTL seconds and
+    never past the token's own expiry.
+    """
+
+    _cache = OrderedDict()
+    _lock = Lock()
+
+    def authenticate(self, request):
+        header = self.get_header(request)
+        if header is None:
+            return None
+
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+
+        key = hashlib.sha256(raw_token).digest()
+        now = time.time()
+
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                expires_at, user, validated_token = hit
+                if expires_at > now:
+                    self._cache.move_to_end(key)
+                    return user, validated_token
+                del self._cache[key]
+
+        validated_token = self.get_validated_token(raw_token)
+        user = self.get_user(validated_token)
+
+        expires_at = now + TOKEN_CACHE_TTL
+        token_exp = validated_token.get('exp')
+        if token_exp is not None:
+            expires_at = min(expires_at, token_exp)
+
+        with self._lock:
+            self._cache[key] = (expires_at, user, validated_token)
+            self._cache.move_to_end(key)
+            while len(self._cache) > TOKEN_CACHE_MAXSIZE:
+                self._cache.popitem(last=False)
+
+        return user, validated_token
+
+    def get_user(self, validated_token):
+        """Fetch only the columns authentication reads, through the cache.
+
+        The stock lookup SELECTs the whole user row per request. Restrict
+        the projection to id/username/is_active and cache the result for
+        USER_CACHE_TTL seconds, which bounds how long a deactivated
+        account can keep authenticating.
+        """
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        def fetch():
+            return self.user_model.objects.only(
+                'id', 'username', 'is_active'
+            ).get(**{api_settings.USER_ID_FIELD: user_id})
+
+        try:
+            user = cache.get_or_set(f'auth:user:{user_id}', fetch, USER_CACHE_TTL)
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        return user
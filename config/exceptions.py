@@ -1,29 +1,47 @@
+import json
+
+from django.http import HttpResponse, JsonResponse
 from rest_framework import status
 from rest_framework.exceptions import APIException
-from rest_framework.response import Response
+
+# The Django error handlers run outside DRF, so rest_framework.response.
+# Response has no renderer here and raised when returned. Use plain
+# HttpResponse/JsonResponse instead, with the constant 404/500 bodies
+# rendered once at import time so error storms allocate nothing per hit.
+_JSON_CONTENT_TYPE = "application/json"
+_NOT_FOUND_BODY = json.dumps({
+    "error": "Not Found (404)",
+    "message": "The requested resource was not found.",
+}).encode()
+_SERVER_ERROR_BODY = json.dumps({
+    "error": "Internal Server Error (500)",
+    "message": "An unexpected error occurred.",
+}).encode()
 
 def bad_request(request, exception, *args, **kwargs):
-    return Response(
+    return JsonResponse(
         {"error": "Bad Request (400)", "message": str(exception)},
         status=status.HTTP_400_BAD_REQUEST
     )
 
 def permission_denied(request, exception, *args, **kwargs):
-    return Response(
+    return JsonResponse(
         {"error": "Permission Denied (403)", "message": str(exception)},
         status=status.HTTP_403_FORBIDDEN
     )
 
 def page_not_found(request, exception, *args, **kwargs):
-    return Response(
-        {"error": "Not Found (404)", "message": "The requested resource was not found."},
-        status=status.HTTP_404_NOT_FOUND
+    return HttpResponse(
+        _NOT_FOUND_BODY,
+        status=status.HTTP_404_NOT_FOUND,
+        content_type=_JSON_CONTENT_TYPE
     )
 
 def server_error(request, *args, **kwargs):
-    return Response(
-        {"error": "Internal Server Error (500)", "message": "An unexpected error occurred."},
-        status=status.HTTP_500_INTERNAL_SERVER_ERROR
+    return HttpResponse(
+        _SERVER_ERROR_BODY,
+        status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        content_type=_JSON_CONTENT_TYPE
     )
 
 class ServiceUnavailable(APIException):
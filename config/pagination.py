@@ -0,0 +1,56 @@
+import hashlib
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+# How long a cached COUNT(*) stays valid. Short enough that page counts
+# track reality, long enough to absorb a burst of page requests.
+COUNT_CACHE_TTL = 60
+
+
+class CachedCountPaginator(Paginator):
+    """Django paginator that caches the total count per query fingerprint.
+
+    Stock pagination runs SELECT COUNT(*) against the filtered queryset on
+    every page request, which is a full index scan per request on large
+    tables. Cache the count keyed on the SQL the queryset would execute, so
+    repeated pages of the same listing reuse one count.
+    """
+
+    @property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is None:
+            return len(self.object_list)
+        key = 'pagination:count:' + hashlib.sha1(
+            str(query).encode()
+        ).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = self.object_list.count()
+            cache.set(key, count, COUNT_CACHE_TTL)
+        return count
+
+
+class CachedCountPageNumberPagination(PageNumberPagination):
+    """Page-number pagination backed by the count-caching paginator."""
+    django_paginator_class = CachedCountPaginator
+
+
+class FileCursorPagination(CursorPagination):
+    """Keyset pagination for file listings.
+
+    OFFSET/LIMIT still walks and discards the skipped rows, so deep pages
+    get slower the further in you go. A cursor on the indexed created_at
+    column keeps every page at O(page_size).
+    """
+    ordering = '-created_at'
+    page_size = 20
+
+
+class ChunkCursorPagination(CursorPagination):
+    """Keyset pagination for chunk listings, following the model ordering."""
+    # id is appended as a tiebreaker since (file, chunk_number) repeats
+    # across replicas on different storage nodes.
+    ordering = ('file_id', 'chunk_number', 'id')
+    page_size = 20
@@ -1,4 +1,5 @@
 from datetime import timedelta
+from logging.config import dictConfig
 from pathlib import Path
 from dotenv import load_dotenv
 from os import getenv, path
@@ -138,14 +139,19 @@ STATIC_ROOT = str(BASE_DIR / "staticfiles")
 MEDIA_URL = '/media/'
 MEDIA_ROOT = str(BASE_DIR / 'media')
 
+# Read size for streaming upload hashing. Throughput climbs steeply up to
+# ~1-2 MiB buffers (fewer syscalls and Python-level iterations) before
+# plateauing, so default to 1 MiB.
+STORAGE_HASH_BUF = 1 << 20
+
 # DRF Settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'config.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'config.pagination.CachedCountPageNumberPagination',
     'PAGE_SIZE': 20,
 }
 # JWT Settings
@@ -163,6 +169,24 @@ SPECTACULAR_SETTINGS = {
 
 LOGGING_CONFIG = None
 
+try:
+    import os
+    import zstandard
+
+    def _compress_rotated_log(path):
+        """Compress a rotated log file with zstd.
+
+        zstd compresses log-like data an order of magnitude faster than the
+        DEFLATE used by compression="zip", keeping the rotation window short.
+        """
+        with open(path, 'rb') as src, open(path + '.zst', 'wb') as dst:
+            zstandard.ZstdCompressor(level=3, threads=-1).copy_stream(src, dst)
+        os.remove(path)
+
+    LOG_COMPRESSION = _compress_rotated_log
+except ImportError:
+    LOG_COMPRESSION = "zip"
+
 LOGURU_LOGGING = {
     "handlers": [
         {
@@ -173,7 +197,10 @@ LOGURU_LOGGING = {
             "{message}",
             "rotation": "10MB",
             "retention": "30 days",
-            "compression": "zip",
+            "compression": LOG_COMPRESSION,
+            # Hand records to a background writer so request threads never
+            # block on file I/O or rotation/compression.
+            "enqueue": True,
         },
         {
             "sink": BASE_DIR / "logs/error.log",
@@ -182,7 +209,8 @@ LOGURU_LOGGING = {
             "{message}",
             "rotation": "10MB",
             "retention": "30 days",
-            "compression": "zip",
+            "compression": LOG_COMPRESSION,
+            "enqueue": True,
             "backtrace": True,
             "diagnose": True,
         },
@@ -194,5 +222,16 @@ LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
     "handlers": {"loguru": {"class": "interceptor.InterceptHandler"}},
+    # Suppress chatty framework loggers before they reach the intercept
+    # handler; every record that gets through pays a frame walk to map the
+    # stdlib call site into loguru.
+    "loggers": {
+        "django.db.backends": {"level": "WARNING"},
+        "django.utils.autoreload": {"level": "WARNING"},
+    },
     "root": {"handlers": ["loguru"], "level": "DEBUG"},
-}
\ No newline at end of file
+}
+# LOGGING_CONFIG = None keeps Django's own logging setup out of the way,
+# so the dict has to be applied here for the intercept handler and the
+# logger levels above to actually install.
+dictConfig(LOGGING)
\ No newline at end of file
@@ -0,0 +1,10 @@
+from logging.config import dictConfig
+
+from .base import *  # noqa
+from .base import LOGGING
+
+# Production keeps only INFO and above; DEBUG-level records would each pay
+# the stdlib-to-loguru interception cost for output nobody reads. Re-apply
+# the dict since base.py already configured logging at DEBUG.
+LOGGING["root"]["level"] = "INFO"
+dictConfig(LOGGING)
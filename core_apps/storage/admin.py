@@ -33,8 +33,10 @@ class StorageNodeAdmin(admin.ModelAdmin):
 class FileAdmin(admin.ModelAdmin):
     list_display = ('name', 'file_type', 'size_mb', 'user', 'created_at', 'is_deleted')
     list_filter = ('is_deleted', 'content_type', 'created_at')
-    search_fields = ('name', 'checksum', 'user__username')
-    readonly_fields = ('created_at', 'updated_at', 'deleted_at', 'file_preview')
+    # checksum is stored as bytea now, which LIKE-based admin search
+    # cannot scan, and the digest is not hand-editable.
+    search_fields = ('name', 'user__username')
+    readonly_fields = ('checksum', 'created_at', 'updated_at', 'deleted_at', 'file_preview')
     fieldsets = (
         ('File Information', {
             'fields': ('name', 'user', 'size', 'checksum', 'content_type')
@@ -48,6 +50,13 @@ class FileAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # Join the user for the changelist and prefetch the inlined
+        # relations shown on the change page.
+        return super().get_queryset(request).select_related(
+            'user'
+        ).prefetch_related('chunks', 'versions')
+
     def file_type(self, obj):
         return obj.get_file_type().title()
     file_type.short_description = 'Type'
@@ -76,8 +85,8 @@ class ChunkInline(admin.TabularInline):
 class ChunkAdmin(admin.ModelAdmin):
     list_display = ('id', 'file_name', 'chunk_number', 'storage_node', 'object_key', 'size_mb', 'status', 'is_primary')
     list_filter = ('status', 'is_primary', 'storage_node')
-    search_fields = ('file__name', 'checksum')
-    readonly_fields = ('created_at', 'updated_at')
+    search_fields = ('file__name',)
+    readonly_fields = ('checksum', 'created_at', 'updated_at')
     fieldsets = (
         ('Chunk Information', {
             'fields': ('file', 'chunk_number', 'storage_node', 'object_key', 'size', 'checksum')
@@ -87,6 +96,10 @@ class ChunkAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # file_name and the storage_node column dereference FKs per row.
+        return super().get_queryset(request).select_related('file', 'storage_node')
+
     def file_name(self, obj):
         return obj.file.name
     file_name.short_description = 'File'
@@ -106,8 +119,8 @@ class FileVersionInline(admin.TabularInline):
 class FileVersionAdmin(admin.ModelAdmin):
     list_display = ('version_number', 'file_name', 'size_mb', 'created_at', 'created_by')
     list_filter = ('created_at', 'created_by')
-    search_fields = ('file__name', 'checksum')
-    readonly_fields = ('created_at', 'version_number')
+    search_fields = ('file__name',)
+    readonly_fields = ('checksum', 'created_at', 'version_number')
     fieldsets = (
         ('Version Information', {
             'fields': ('file', 'version_number', 'size', 'checksum')
@@ -117,6 +130,9 @@ class FileVersionAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('file', 'created_by')
+
     def file_name(self, obj):
         return obj.file.name
     file_name.short_description = 'File'
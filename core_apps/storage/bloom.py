@@ -0,0 +1,137 @@
+"""Process-local Bloom filters in front of the checksum dedup probes.
+
+A Bloom filter answers "definitely not present" in O(1) without a
+query, so the upload path only pays for a DB probe when a checksum
+might already exist. Implemented in pure Python (no pybloom-live or
+RedisBloom dependency here); a 1% error rate costs under 10 bits per
+entry, so even a million checksums fit in ~1.2 MB per process.
+"""
+
+import math
+import threading
+import time
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """Fixed-size bit-array Bloom filter using double hashing."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.num_bits = max(
+            8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2))
+        )
+        self.num_hashes = max(
+            1, round(self.num_bits / capacity * math.log(2))
+        )
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _indexes(self, item):
+        if isinstance(item, str):
+            item = item.encode()
+        digest = blake2b(item, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'big')
+        h2 = int.from_bytes(digest[8:], 'big') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, item):
+        for idx in self._indexes(item):
+            self._bits[idx >> 3] |= 1 << (idx & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        return all(
+            self._bits[idx >> 3] & (1 << (idx & 7))
+            for idx in self._indexes(item)
+        )
+
+
+class ChecksumBloom:
+    """A lazily-warmed, periodically rebuilt filter over a checksum column.
+
+    Rebuilds scan the whole column, so they run on a background thread
+    and the finished filter is swapped in under the lock - no request
+    ever waits on the scan. Lookups made before a warm-up completes
+    report a possible hit and fall through to the DB probe, which is
+    also how warm-up failures degrade.
+
+    might_contain() is authoritative only for checksums this process has
+    seen: rows created by other processes since the last rebuild can
+    produce false negatives until REFRESH_INTERVAL elapses. Callers must
+    treat a skipped probe as "assume new", never as proof of absence for
+    anything correctness-critical.
+    """
+
+    REFRESH_INTERVAL = 300
+    # Spare capacity over the warm-time row count before a rebuild is
+    # forced to keep the false-positive rate near the configured target.
+    HEADROOM = 4
+
+    def __init__(self, source, error_rate=0.01):
+        self._source = source
+        self._error_rate = error_rate
+        self._lock = threading.Lock()
+        # Held for the duration of a rebuild so only one runs at a time.
+        self._warm_lock = threading.Lock()
+        self._filter = None
+        self._warmed_at = 0.0
+
+    def _needs_warm(self):
+        return (
+            self._filter is None
+            or self._filter.count >= self._filter.capacity
+            or time.monotonic() - self._warmed_at > self.REFRESH_INTERVAL
+        )
+
+    def warm(self):
+        """Rebuild the filter from the source column, synchronously.
+
+        The scan and filter construction happen without holding the
+        lookup lock; only swapping in the finished filter takes it.
+        """
+        values = [value for value in self._source() if value]
+        refreshed = BloomFilter(
+            capacity=max(len(values) * self.HEADROOM, 1024),
+            error_rate=self._error_rate,
+        )
+        for value in values:
+            refreshed.add(value)
+        with self._lock:
+            self._filter = refreshed
+            self._warmed_at = time.monotonic()
+
+    def _warm_in_background(self):
+        if not self._warm_lock.acquire(blocking=False):
+            return  # a rebuild is already in flight
+
+        def rebuild():
+            try:
+                self.warm()
+            except Exception:
+                pass  # fail open: lookups keep reporting possible hits
+            finally:
+                self._warm_lock.release()
+
+        threading.Thread(
+            target=rebuild, name='checksum-bloom-warm', daemon=True
+        ).start()
+
+    def might_contain(self, checksum):
+        if not checksum:
+            return True
+        with self._lock:
+            current = self._filter
+            result = True if current is None else checksum in current
+        if self._needs_warm():
+            self._warm_in_background()
+        return result
+
+    def add(self, checksum):
+        if not checksum:
+            return
+        with self._lock:
+            if self._filter is not None:
+                self._filter.add(checksum)
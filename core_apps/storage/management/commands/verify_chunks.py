@@ -0,0 +1,50 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db.models import F, Q
+from django.utils import timezone
+
+from core_apps.storage.models import Chunk
+from core_apps.storage.verification import verify_chunks
+
+
+class Command(BaseCommand):
+    help = 'Verify stored chunk bytes against their recorded checksums in batches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=1000,
+            help='Maximum number of chunks to verify in this run',
+        )
+        parser.add_argument(
+            '--older-than',
+            type=int,
+            default=24,
+            help='Only verify chunks last verified more than this many hours ago (never-verified chunks always qualify)',
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Number of hashing threads (defaults to the CPU count)',
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(hours=options['older_than'])
+        stale = (
+            Chunk.objects.filter(
+                Q(last_verified_at__isnull=True) | Q(last_verified_at__lt=cutoff)
+            )
+            .exclude(status=Chunk.ChunkStatus.DELETED)
+            .order_by(F('last_verified_at').asc(nulls_first=True))[: options['limit']]
+        )
+
+        results = verify_chunks(stale, max_workers=options['workers'])
+        corrupted = sum(1 for is_valid in results.values() if not is_valid)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Verified {len(results)} chunks ({corrupted} corrupted)'
+            )
+        )
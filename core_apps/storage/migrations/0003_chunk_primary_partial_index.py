@@ -0,0 +1,26 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("storage", "0002_chunk_object_key"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chunk",
+            name="is_primary",
+            field=models.BooleanField(
+                default=False, help_text="Whether this is the primary copy"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="chunk",
+            index=models.Index(
+                condition=models.Q(("is_primary", True)),
+                fields=["file", "chunk_number"],
+                name="chunk_primary_partial",
+            ),
+        ),
+    ]
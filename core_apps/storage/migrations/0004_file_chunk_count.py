@@ -0,0 +1,33 @@
+from django.db import migrations, models
+
+
+def backfill_chunk_counts(apps, schema_editor):
+    File = apps.get_model("storage", "File")
+    Chunk = apps.get_model("storage", "Chunk")
+    counts = models.Subquery(
+        Chunk.objects.filter(file=models.OuterRef("pk"))
+        .values("file")
+        .annotate(n=models.Count("pk"))
+        .values("n")
+    )
+    File.objects.update(chunk_count=models.functions.Coalesce(counts, 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("storage", "0003_chunk_primary_partial_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="chunk_count",
+            field=models.PositiveIntegerField(
+                db_index=True,
+                default=0,
+                help_text="Denormalized count of chunks stored for this file",
+            ),
+        ),
+        migrations.RunPython(backfill_chunk_counts, migrations.RunPython.noop),
+    ]
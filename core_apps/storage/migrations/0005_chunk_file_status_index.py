@@ -0,0 +1,17 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("storage", "0004_file_chunk_count"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="chunk",
+            index=models.Index(
+                fields=["file", "status"], name="chunk_file_status"
+            ),
+        ),
+    ]
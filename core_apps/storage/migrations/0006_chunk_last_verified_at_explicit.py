@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("storage", "0005_chunk_file_status_index"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="chunk",
+            name="last_verified_at",
+            field=models.DateTimeField(blank=True, db_index=True, null=True),
+        ),
+    ]
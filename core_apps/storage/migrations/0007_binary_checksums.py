@@ -0,0 +1,87 @@
+from django.db import migrations
+
+import core_apps.storage.fields
+
+
+def _to_bytea(table, column):
+    return (
+        f"ALTER TABLE {table} ALTER COLUMN {column} TYPE bytea "
+        f"USING decode({column}, 'hex');"
+    )
+
+
+def _to_varchar(table, column):
+    return (
+        f"ALTER TABLE {table} ALTER COLUMN {column} TYPE varchar(64) "
+        f"USING encode({column}, 'hex');"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("storage", "0006_chunk_last_verified_at_explicit"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=_to_bytea("storage_file", "checksum"),
+            reverse_sql=_to_varchar("storage_file", "checksum"),
+            state_operations=[
+                migrations.AlterField(
+                    model_name="file",
+                    name="checksum",
+                    field=core_apps.storage.fields.Sha256Field(
+                        db_index=True,
+                        help_text="SHA-256 checksum of the file",
+                        max_length=32,
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=_to_bytea("storage_chunk", "checksum"),
+            reverse_sql=_to_varchar("storage_chunk", "checksum"),
+            state_operations=[
+                migrations.AlterField(
+                    model_name="chunk",
+                    name="checksum",
+                    field=core_apps.storage.fields.Sha256Field(
+                        blank=True,
+                        help_text="SHA-256 checksum of the chunk",
+                        max_length=32,
+                        null=True,
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=_to_bytea("storage_chunk", "stored_checksum"),
+            reverse_sql=_to_varchar("storage_chunk", "stored_checksum"),
+            state_operations=[
+                migrations.AlterField(
+                    model_name="chunk",
+                    name="stored_checksum",
+                    field=core_apps.storage.fields.Sha256Field(
+                        blank=True,
+                        help_text="SHA-256 checksum of the stored chunk",
+                        max_length=32,
+                        null=True,
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunSQL(
+            sql=_to_bytea("storage_fileversion", "checksum"),
+            reverse_sql=_to_varchar("storage_fileversion", "checksum"),
+            state_operations=[
+                migrations.AlterField(
+                    model_name="fileversion",
+                    name="checksum",
+                    field=core_apps.storage.fields.Sha256Field(
+                        help_text="SHA-256 checksum", max_length=32
+                    ),
+                ),
+            ],
+        ),
+    ]
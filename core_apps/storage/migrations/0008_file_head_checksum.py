@@ -0,0 +1,24 @@
+from django.db import migrations
+
+import core_apps.storage.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("storage", "0007_binary_checksums"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="head_checksum",
+            field=core_apps.storage.fields.Sha256Field(
+                blank=True,
+                db_index=True,
+                help_text="SHA-256 of the first 1 MiB, used as a cheap duplicate probe",
+                max_length=32,
+                null=True,
+            ),
+        ),
+    ]
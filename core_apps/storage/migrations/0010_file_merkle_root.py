@@ -0,0 +1,28 @@
+from django.db import migrations
+
+import core_apps.storage.fields
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("storage", "0009_file_user_checksum_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="file",
+            name="merkle_root",
+            field=core_apps.storage.fields.Sha256Field(
+                blank=True,
+                help_text=(
+                    "SHA-256 over the ordered chunk digests; with the "
+                    "Chunk rows as level 0 this lets a verifier recompute "
+                    "the file identity from chunk hashes without "
+                    "re-reading the bytes"
+                ),
+                max_length=32,
+                null=True,
+            ),
+        ),
+    ]
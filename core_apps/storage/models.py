@@ -1,11 +1,66 @@
 import uuid
 import os
+from functools import cached_property
 from django.db import models, transaction
+from django.db.models import Exists, F, OuterRef, Sum
 from django.utils import timezone
 from django.urls import reverse
 from django.conf import settings
 from django.core.files.storage import default_storage
 
+from .fields import Sha256Field
+
+# MIME types (and top-level tokens like 'image') mapped to file categories,
+# so classification is a dict lookup instead of substring scans per access.
+_FILE_TYPE_MAP = {
+    'image': 'image',
+    'text': 'document',
+    'application/pdf': 'document',
+    'application/msword': 'document',
+    'application/zip': 'archive',
+    'application/x-zip-compressed': 'archive',
+    'application/vnd.rar': 'archive',
+    'application/x-rar-compressed': 'archive',
+    'application/x-tar': 'archive',
+    'application/x-7z-compressed': 'archive',
+    'application/gzip': 'archive',
+    'application/x-gzip': 'archive',
+}
+_OPENXML_PREFIX = 'application/vnd.openxmlformats-'
+
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB', 'TB', 'PB')
+
+# reverse() walks the resolver and formats arguments on every call, which
+# adds up when admin pages and serializers emit URLs for many rows.
+# Resolve each pattern once with a placeholder pk and cache the template.
+_URL_PLACEHOLDER = '00000000-0000-0000-0000-000000000000'
+_URL_TEMPLATES = {}
+
+
+def _detail_url(viewname, pk):
+    """Format a detail URL from a cached template for the given view."""
+    template = _URL_TEMPLATES.get(viewname)
+    if template is None:
+        template = reverse(viewname, args=[_URL_PLACEHOLDER]).replace(
+            _URL_PLACEHOLDER, '{pk}'
+        )
+        _URL_TEMPLATES[viewname] = template
+    return template.format(pk=pk)
+
+
+def _classify_content_type(content_type):
+    """Map a MIME type to one of 'image', 'document', 'archive', 'other'."""
+    if not content_type:
+        return 'other'
+    file_type = (_FILE_TYPE_MAP.get(content_type)
+                 or _FILE_TYPE_MAP.get(content_type.split('/', 1)[0]))
+    if file_type:
+        return file_type
+    if content_type.startswith(_OPENXML_PREFIX):
+        return 'document'
+    return 'other'
+
+
 class StorageNode(models.Model):
     """Represents a storage node where file chunks are stored."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -37,6 +92,31 @@ class StorageNode(models.Model):
         self.is_active = self.available > 0
         self.save(update_fields=['available', 'is_active'])
 
+    # Prefer the StorageNodeViewSet.get_queryset annotations when present
+    # so list/detail stay DB-computed; plain instances (e.g. the one
+    # serializer.save() returns on create) fall back to Python.
+
+    @property
+    def capacity_gb(self):
+        annotated = getattr(self, 'capacity_gb_annotated', None)
+        if annotated is not None:
+            return annotated
+        return self.capacity / 1024 ** 3
+
+    @property
+    def available_gb(self):
+        annotated = getattr(self, 'available_gb_annotated', None)
+        if annotated is not None:
+            return annotated
+        return self.available / 1024 ** 3
+
+    @property
+    def status(self):
+        annotated = getattr(self, 'status_annotated', None)
+        if annotated is not None:
+            return annotated
+        return 'active' if self.is_active else 'inactive'
+
 
 class FileManager(models.Manager):
     """Custom manager for File model with common queries."""
@@ -53,17 +133,46 @@ class FileManager(models.Manager):
         """Return files larger than specified size in MB."""
         return self.filter(size__gt=size_mb * 1024 * 1024)
 
+    def with_availability(self):
+        """Annotate each file with whether it has completed chunks.
+
+        The correlated EXISTS becomes a single index probe per row on
+        (file, status), so availability costs no extra queries.
+        """
+        return self.annotate(
+            has_chunks=Exists(
+                Chunk.objects.filter(
+                    file=OuterRef('pk'),
+                    status=Chunk.ChunkStatus.COMPLETED,
+                )
+            )
+        )
+
 
 class File(models.Model):
     """Represents a file that has been uploaded to the system."""
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255, db_index=True)
     size = models.BigIntegerField(help_text="File size in bytes", db_index=True)
-    checksum = models.CharField(
-        max_length=64, 
+    checksum = Sha256Field(
         help_text="SHA-256 checksum of the file",
         db_index=True
     )
+    head_checksum = Sha256Field(
+        null=True,
+        blank=True,
+        db_index=True,
+        help_text="SHA-256 of the first 1 MiB, used as a cheap duplicate probe"
+    )
+    merkle_root = Sha256Field(
+        null=True,
+        blank=True,
+        help_text=(
+            "SHA-256 over the ordered chunk digests; with the Chunk rows "
+            "as level 0 this lets a verifier recompute the file identity "
+            "from chunk hashes without re-reading the bytes"
+        )
+    )
     content_type = models.CharField(
         max_length=100,
         blank=True,
@@ -76,6 +185,11 @@ class File(models.Model):
         null=True,
         blank=True
     )
+    chunk_count = models.PositiveIntegerField(
+        default=0,
+        db_index=True,
+        help_text="Denormalized count of chunks stored for this file"
+    )
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted_at = models.DateTimeField(null=True, blank=True)
@@ -93,13 +207,18 @@ class File(models.Model):
                 name='unique_file_name_checksum_user'
             )
         ]
+        indexes = [
+            # Serves the upload dedup probe; the unique constraint above
+            # leads with name, so it cannot answer (user, checksum) lookups.
+            models.Index(fields=['user', 'checksum'], name='file_user_checksum'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.get_human_readable_size()})"
 
     def get_absolute_url(self):
         """Get URL for file detail view."""
-        return reverse('storage:file-detail', args=[str(self.id)])
+        return _detail_url('storage:file-detail', self.id)
 
     def soft_delete(self):
         """Mark the file as deleted instead of removing it."""
@@ -116,55 +235,50 @@ class File(models.Model):
     @property
     def is_available(self):
         """Check if the file is available (not deleted and has chunks)."""
-        return not self.is_deleted and self.chunks.exists()
+        # Prefer the with_availability() annotation when present, falling
+        # back to the denormalized counter; neither costs an extra query.
+        has_chunks = getattr(self, 'has_chunks', None)
+        if has_chunks is None:
+            has_chunks = self.chunk_count > 0
+        return not self.is_deleted and has_chunks
+
+    @cached_property
+    def file_type_cached(self):
+        """Classify the content type once per instance."""
+        return _classify_content_type(self.content_type)
 
     @property
     def is_image(self):
         """Check if the file is an image."""
-        return self.content_type and self.content_type.startswith('image/')
+        return self.file_type_cached == 'image'
 
     @property
     def is_document(self):
         """Check if the file is a document."""
-        return (self.content_type and 
-                any(t in self.content_type for t in ['text/', 'application/pdf', 
-                    'application/msword', 'application/vnd.openxmlformats-']))
+        return self.file_type_cached == 'document'
 
     @property
     def is_archive(self):
         """Check if the file is an archive."""
-        return (self.content_type and 
-                any(t in self.content_type for t in ['zip', 'rar', 'tar', '7z', 'gz']))
+        return self.file_type_cached == 'archive'
 
     def get_human_readable_size(self):
         """Convert size in bytes to human readable format."""
-        size = self.size
-        if size is None:
-            return "0.00 B"
-
         try:
-            size = float(size)
+            size = int(self.size)
         except (TypeError, ValueError):
             return "0.00 B"
 
-        if size < 0:
+        if size <= 0:
             return "0.00 B"
 
-        for unit in ['B', 'KB', 'MB', 'GB', 'TB']:
-            if size < 1024.0:
-                return f"{size:.2f} {unit}"
-            size /= 1024.0
-        return f"{size:.2f} PB"
+        # bit_length picks the unit directly; no divide-by-1024 loop.
+        index = min((size.bit_length() - 1) // 10, len(_SIZE_UNITS) - 1)
+        return f"{size / (1 << (index * 10)):.2f} {_SIZE_UNITS[index]}"
 
     def get_file_type(self):
         """Categorize file into types like image, document, etc."""
-        if self.is_image:
-            return 'image'
-        elif self.is_document:
-            return 'document'
-        elif self.is_archive:
-            return 'archive'
-        return 'other'
+        return self.file_type_cached
 
 
 class Chunk(models.Model):
@@ -197,16 +311,14 @@ class Chunk(models.Model):
     )
     chunk_number = models.PositiveIntegerField(db_index=True)
     size = models.PositiveIntegerField(help_text="Chunk size in bytes")
-    checksum = models.CharField(
+    checksum = Sha256Field(
         null=True,
         blank=True,
-        max_length=64, 
         help_text="SHA-256 checksum of the chunk"
     )
     is_primary = models.BooleanField(
-        default=False, 
-        help_text="Whether this is the primary copy",
-        db_index=True
+        default=False,
+        help_text="Whether this is the primary copy"
     )
     status = models.CharField(
         max_length=10,
@@ -214,13 +326,12 @@ class Chunk(models.Model):
         default=ChunkStatus.UPLOADING,
         db_index=True
     )
-    stored_checksum = models.CharField(
+    stored_checksum = Sha256Field(
         null=True,
         blank=True,
-        max_length=64, 
         help_text="SHA-256 checksum of the stored chunk"
     )
-    last_verified_at = models.DateTimeField(null=True, blank=True, auto_now_add=True, db_index=True)
+    last_verified_at = models.DateTimeField(null=True, blank=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -229,6 +340,17 @@ class Chunk(models.Model):
         ordering = ['chunk_number']
         verbose_name = 'File Chunk'
         verbose_name_plural = 'File Chunks'
+        indexes = [
+            # Partial index covering the SELECT FOR UPDATE in mark_as_primary;
+            # only primary rows are indexed, so probes touch a tiny index.
+            models.Index(
+                fields=['file', 'chunk_number'],
+                condition=models.Q(is_primary=True),
+                name='chunk_primary_partial'
+            ),
+            # Serves the correlated EXISTS in FileManager.with_availability.
+            models.Index(fields=['file', 'status'], name='chunk_file_status'),
+        ]
 
     def __str__(self):
         return (f"Chunk {self.chunk_number} of {self.file.name} "
@@ -236,7 +358,7 @@ class Chunk(models.Model):
 
     def get_absolute_url(self):
         """Get URL for chunk detail view."""
-        return reverse('storage:chunk-detail', args=[str(self.id)])
+        return _detail_url('storage:chunk-detail', self.id)
 
     def mark_as_primary(self):
         """Mark this chunk as the primary copy."""
@@ -255,9 +377,13 @@ class Chunk(models.Model):
     def verify_checksum(self, calculated_checksum):
         """Verify if the chunk's checksum matches the calculated one."""
         is_valid = self.checksum == calculated_checksum
+        self.stored_checksum = calculated_checksum
+        self.last_verified_at = timezone.now()
+        update_fields = ['stored_checksum', 'last_verified_at']
         if not is_valid:
             self.status = self.ChunkStatus.CORRUPTED
-            self.save(update_fields=['status'])
+            update_fields.append('status')
+        self.save(update_fields=update_fields)
         return is_valid
 
     @property
@@ -265,16 +391,28 @@ class Chunk(models.Model):
         """Check if the chunk is marked as corrupted."""
         return self.status == self.ChunkStatus.CORRUPTED
 
+    def save(self, *args, **kwargs):
+        """Override save to keep the file's denormalized chunk count current."""
+        is_new = self._state.adding
+        super().save(*args, **kwargs)
+        if is_new:
+            File.objects.filter(pk=self.file_id).update(
+                chunk_count=F('chunk_count') + 1
+            )
+
     def delete(self, *args, **kwargs):
         """Override delete to handle storage node space."""
         storage_node = self.storage_node
+        file_id = self.file_id
         super().delete(*args, **kwargs)
+        File.objects.filter(pk=file_id, chunk_count__gt=0).update(
+            chunk_count=F('chunk_count') - 1
+        )
         # Update storage node's available space
         if storage_node:
-            used_space = sum(
-                chunk.size for chunk in 
-                Chunk.objects.filter(storage_node=storage_node)
-            )
+            used_space = Chunk.objects.filter(
+                storage_node=storage_node
+            ).aggregate(used=Sum('size'))['used'] or 0
             storage_node.update_storage_metrics(used_space)
     
 
@@ -289,7 +427,7 @@ class FileVersion(models.Model):
     )
     version_number = models.PositiveIntegerField()
     size = models.BigIntegerField(help_text="File size in bytes")
-    checksum = models.CharField(max_length=64, help_text="SHA-256 checksum")
+    checksum = Sha256Field(help_text="SHA-256 checksum")
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -310,11 +448,19 @@ class FileVersion(models.Model):
 
     def get_absolute_url(self):
         """Get URL for file version detail view."""
-        return reverse('storage:file-version-detail', args=[str(self.id)])
+        return _detail_url('storage:file-version-detail', self.id)
 
     def restore(self):
-        """Restore this version of the file."""
+        """Restore this version of the file.
+
+        Issues a single UPDATE against the File row instead of a model
+        save, and mirrors the values onto the in-memory instance for the
+        caller. Callers racing on the same file should hold a row lock
+        (see FileVersionViewSet.restore).
+        """
+        File.objects.filter(pk=self.file_id).update(
+            size=self.size, checksum=self.checksum
+        )
         self.file.size = self.size
         self.file.checksum = self.checksum
-        self.file.save(update_fields=['size', 'checksum'])
         return self.file
\ No newline at end of file
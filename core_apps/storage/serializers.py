@@ -2,32 +2,31 @@ from rest_framework import serializers
 from .models import StorageNode, File, Chunk, FileVersion
 
 class StorageNodeSerializer(serializers.ModelSerializer):
-    status = serializers.SerializerMethodField()
-    available_gb = serializers.SerializerMethodField()
-    capacity_gb = serializers.SerializerMethodField()
+    # Backed by model properties that prefer the annotations added in
+    # StorageNodeViewSet.get_queryset, so the database computes these for
+    # list/detail rows while plain instances (such as the one
+    # serializer.save() returns on create) still serialize completely.
+    status = serializers.CharField(read_only=True)
+    available_gb = serializers.FloatField(read_only=True)
+    capacity_gb = serializers.FloatField(read_only=True)
 
     class Meta:
         model = StorageNode
         fields = [
-            'id', 'name', 'host', 'port', 
+            'id', 'name', 'host', 'port',
             'capacity', 'capacity_gb', 'available', 'available_gb',
             'is_active', 'status', 'last_heartbeat', 'created_at'
         ]
         read_only_fields = ['id', 'last_heartbeat', 'available', 'created_at']
 
-    def get_status(self, obj):
-        return 'active' if obj.is_active else 'inactive'
-
-    def get_available_gb(self, obj):
-        return obj.available / (1024 ** 3)
-
-    def get_capacity_gb(self, obj):
-        return obj.capacity / (1024 ** 3)
-
 class FileSerializer(serializers.ModelSerializer):
-    file_type = serializers.SerializerMethodField()
+    # Reads the per-instance cached classification directly instead of
+    # re-running it through a SerializerMethodField.
+    file_type = serializers.CharField(source='file_type_cached', read_only=True)
     size_mb = serializers.SerializerMethodField()
     is_available = serializers.BooleanField(read_only=True)
+    # Stored as raw bytes (Sha256Field); expose the hex string.
+    checksum = serializers.CharField(read_only=True)
 
     class Meta:
         model = File
@@ -44,9 +43,6 @@ class FileSerializer(serializers.ModelSerializer):
             'user': {'required': False}  # Will be set in the view
         }
 
-    def get_file_type(self, obj):
-        return obj.get_file_type()
-
     def get_size_mb(self, obj):
         return obj.size / (1024 * 1024) if obj.size else 0
 
@@ -54,9 +50,13 @@ class ChunkSerializer(serializers.ModelSerializer):
     file_name = serializers.CharField(source='file.name', read_only=True)
     storage_node_name = serializers.CharField(source='storage_node.name', read_only=True)
     is_corrupted = serializers.BooleanField(read_only=True)
-    object_key = serializers.CharField(source='object_key', read_only=True)
-    stored_checksum = serializers.CharField(source='stored_checksum', read_only=True)
-    last_verified_at = serializers.DateTimeField(read_only=True)
+    # Client-writable and fed into Sha256Field's bytes.fromhex, so only a
+    # full 64-character hex digest may pass validation; anything else
+    # would blow up at SQL compile time or be silently truncated.
+    checksum = serializers.RegexField(
+        r'^[0-9a-fA-F]{64}$', required=False, allow_null=True
+    )
+    stored_checksum = serializers.CharField(read_only=True)
 
     class Meta:
         model = Chunk
@@ -73,6 +73,7 @@ class ChunkSerializer(serializers.ModelSerializer):
 class FileVersionSerializer(serializers.ModelSerializer):
     size_mb = serializers.SerializerMethodField()
     created_by_username = serializers.CharField(source='created_by.username', read_only=True)
+    checksum = serializers.CharField(read_only=True)
 
     class Meta:
         model = FileVersion
@@ -1,3 +1,70 @@
-from django.test import TestCase
+from django.conf import settings
+from django.test import SimpleTestCase
+from rest_framework import serializers
 
-# Create your tests here.
+from .bloom import BloomFilter, ChecksumBloom
+from .serializers import ChunkSerializer
+
+
+class SettingsSanityTests(SimpleTestCase):
+    def test_third_party_apps_are_registered(self):
+        """Guards against adjacent string literals in THIRD_PARTY_APPS
+        silently concatenating two app names into one bogus entry."""
+        self.assertIn('rest_framework_simplejwt', settings.INSTALLED_APPS)
+        self.assertIn('drf_spectacular', settings.INSTALLED_APPS)
+
+
+class ChunkSerializerTests(SimpleTestCase):
+    def test_fields_bind_without_redundant_source(self):
+        """Regression: source='object_key' on the object_key field (and the
+        same for stored_checksum) made DRF raise at field binding, taking
+        down every request that touched the serializer."""
+        fields = ChunkSerializer().fields
+        self.assertIn('object_key', fields)
+        self.assertIn('stored_checksum', fields)
+        self.assertIn('last_verified_at', fields)
+
+    def test_checksum_must_be_full_hex_digest(self):
+        """Malformed checksums must fail validation here; past the
+        serializer they hit bytes.fromhex in Sha256Field and 500."""
+        field = ChunkSerializer().fields['checksum']
+        self.assertEqual(field.run_validation('ab' * 32), 'ab' * 32)
+        for bad in ['zz' * 32, 'abcd', 'ab' * 32 + 'c', '']:
+            with self.assertRaises(serializers.ValidationError):
+                field.run_validation(bad)
+
+
+class BloomFilterTests(SimpleTestCase):
+    def test_no_false_negatives(self):
+        bf = BloomFilter(capacity=1000)
+        items = [f'digest-{i}' for i in range(500)]
+        for item in items:
+            bf.add(item)
+        for item in items:
+            self.assertIn(item, bf)
+
+    def test_false_positive_rate_is_bounded(self):
+        bf = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bf.add(f'present-{i}')
+        hits = sum(f'absent-{i}' in bf for i in range(10000))
+        # Generous bound: 5x the configured 1% rate.
+        self.assertLess(hits, 500)
+
+    def test_checksum_bloom_answers_after_a_warm(self):
+        bloom = ChecksumBloom(lambda: ['aa' * 32, 'bb' * 32])
+        bloom.warm()
+        self.assertTrue(bloom.might_contain('aa' * 32))
+        self.assertFalse(bloom.might_contain('cc' * 32))
+        bloom.add('cc' * 32)
+        self.assertTrue(bloom.might_contain('cc' * 32))
+
+    def test_checksum_bloom_reports_hits_until_warmed(self):
+        """Lookups before the background warm-up completes (or if it
+        fails) must fall through to the DB probe, never skip it."""
+
+        def broken_source():
+            raise RuntimeError('db unavailable')
+
+        failing = ChecksumBloom(broken_source)
+        self.assertTrue(failing.might_contain('aa' * 32))
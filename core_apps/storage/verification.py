@@ -0,0 +1,54 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.files.storage import default_storage
+from django.utils import timezone
+
+from .models import Chunk
+
+
+def calculate_checksum(chunk):
+    """Hash a chunk's stored bytes; returns None if the bytes are missing."""
+    if not chunk.object_key or not default_storage.exists(chunk.object_key):
+        return None
+    digest = hashlib.sha256()
+    with default_storage.open(chunk.object_key, 'rb') as stored:
+        for data in stored.chunks():
+            digest.update(data)
+    return digest.hexdigest()
+
+
+def verify_chunks(chunks, max_workers=None):
+    """Verify a batch of chunks and persist the results in one bulk_update.
+
+    Integrity checking is embarrassingly parallel - the SHA-256 core
+    releases the GIL - so the stored bytes are hashed across a thread
+    pool and all result rows (stored_checksum, last_verified_at and any
+    corruption status) are written back with a single bulk_update instead
+    of one UPDATE per chunk. Returns {chunk pk: is_valid}.
+    """
+    chunks = list(chunks)
+    if not chunks:
+        return {}
+
+    workers = max_workers or min(len(chunks), os.cpu_count() or 2)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = list(pool.map(calculate_checksum, chunks))
+
+    now = timezone.now()
+    results = {}
+    for chunk, digest in zip(chunks, digests):
+        is_valid = digest is not None and digest == chunk.checksum
+        chunk.stored_checksum = digest
+        chunk.last_verified_at = now
+        if not is_valid:
+            chunk.status = Chunk.ChunkStatus.CORRUPTED
+        results[chunk.pk] = is_valid
+
+    Chunk.objects.bulk_update(
+        chunks,
+        ['stored_checksum', 'last_verified_at', 'status'],
+        batch_size=500,
+    )
+    return results
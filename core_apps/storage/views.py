@@ -1,13 +1,28 @@
 import hashlib
 import os
-from django.db import transaction
+import uuid
+from datetime import timedelta
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from django.http import StreamingHttpResponse
+from django.db.models import Case, CharField, ExpressionWrapper, F, FloatField, Max, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import action, parser_classes
+from rest_framework.fields import DateTimeField
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
-from config.exceptions import ValidationError, NotFound
+from rest_framework.renderers import JSONRenderer
+from config.exceptions import ValidationError, NotFound, ServiceUnavailable
+from config.pagination import ChunkCursorPagination, FileCursorPagination
+from .bloom import ChecksumBloom
 from .models import StorageNode, File, Chunk, FileVersion
+from .verification import verify_chunks
 from .serializers import (
     StorageNodeSerializer, 
     FileSerializer, 
@@ -16,6 +31,72 @@ from .serializers import (
     FileVersionSerializer
 )
 
+# hashlib.sha256 is backed by OpenSSL's EVP layer, which dispatches to
+# SHA-NI/AVX2 kernels at runtime on capable CPUs, so binding the
+# constructor once at import gets the hardware path without re-doing the
+# algorithm name lookup that hashlib.new('sha256') pays per call.
+_HASH_CTOR = hashlib.sha256
+
+# OpenSSL releases the GIL while hashing, so independent chunk payloads can
+# be digested on separate cores. One process-wide pool serves all uploads;
+# concurrent requests share the lanes.
+_HASH_POOL = ThreadPoolExecutor(
+    max_workers=os.cpu_count() or 2, thread_name_prefix='chunk-hash'
+)
+
+# Storage writes are pure I/O and release the GIL, so staging them on a
+# separate small pool lets the request thread keep reading and hashing the
+# next chunks while earlier ones are still being written.
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='chunk-io')
+
+
+def _hash_hex(data):
+    return _HASH_CTOR(data).hexdigest()
+
+
+# Number of chunks whose digests are resolved and dedup-checked together;
+# one SELECT ... WHERE checksum IN (...) per batch.
+_DEDUP_BATCH = 16
+
+# How much of the upload's head feeds the cheap duplicate probe.
+_HEAD_PROBE_SIZE = 1 << 20
+
+# Formats datetimes exactly the way FileSerializer would, for the
+# hand-built upload response.
+_ISO_DATETIME = DateTimeField()
+
+
+def _uuid_or_404(pk):
+    """Turn a malformed UUID pk into the 404 that get_object would raise.
+
+    Actions that filter on the raw URL pk (instead of fetching the row)
+    must reject garbage themselves; the router's lookup regex admits any
+    non-slash segment and Django raises ValidationError for bad UUIDs.
+    """
+    try:
+        return uuid.UUID(str(pk))
+    except (TypeError, ValueError):
+        raise NotFound()
+
+# Process-local Bloom filters in front of the dedup probes: a definite
+# miss skips the DB query entirely. Misses can be stale across workers,
+# so they are never the last word - a missed chunk match only costs
+# duplicate stored bytes, and a missed file match is backstopped by the
+# unique constraint in FileViewSet.create, which converts the resulting
+# IntegrityError into the usual 409.
+_FILE_CHECKSUMS = ChecksumBloom(
+    lambda: File.objects.values_list('checksum', flat=True).iterator()
+)
+_HEAD_CHECKSUMS = ChecksumBloom(
+    lambda: File.objects.exclude(head_checksum=None)
+    .values_list('head_checksum', flat=True).iterator()
+)
+_CHUNK_CHECKSUMS = ChecksumBloom(
+    lambda: Chunk.objects.exclude(checksum=None)
+    .values_list('checksum', flat=True).iterator()
+)
+
+
 class StorageNodeViewSet(viewsets.ModelViewSet):
     """
     API endpoint for managing storage nodes.
@@ -28,21 +109,75 @@ class StorageNodeViewSet(viewsets.ModelViewSet):
         """Optionally filter by active status."""
         queryset = super().get_queryset()
         if self.request.query_params.get('include_inactive') == 'true':
-            return StorageNode.objects.all()
-        return queryset
+            queryset = StorageNode.objects.all()
+        # Push the serializer's derived fields into the query; Postgres
+        # evaluates these far cheaper than per-row Python methods.
+        gib = 1024.0 ** 3
+        return queryset.annotate(
+            available_gb_annotated=ExpressionWrapper(
+                F('available') / gib, output_field=FloatField()
+            ),
+            capacity_gb_annotated=ExpressionWrapper(
+                F('capacity') / gib, output_field=FloatField()
+            ),
+            status_annotated=Case(
+                When(is_active=True, then=Value('active')),
+                default=Value('inactive'),
+                output_field=CharField(),
+            ),
+        )
+
+    # Heartbeats arriving within this window are acknowledged without a write.
+    HEARTBEAT_THROTTLE = timedelta(seconds=1)
 
     @action(detail=True, methods=['post'])
     def heartbeat(self, request, pk=None):
-        """Update the last_heartbeat timestamp for a storage node."""
-        node = self.get_object()
-        node.update_heartbeat()
-        return Response({'status': 'heartbeat received'})
+        """Update the last_heartbeat timestamp for a storage node.
+
+        Issued as a single conditional UPDATE instead of get_object plus
+        a full save: no row materialization, no signal dispatch, and
+        repeat heartbeats inside the throttle window skip the write.
+        """
+        pk = _uuid_or_404(pk)
+        now = timezone.now()
+        updated = StorageNode.objects.filter(
+            pk=pk, last_heartbeat__lt=now - self.HEARTBEAT_THROTTLE
+        ).update(last_heartbeat=now)
+        if not updated and not StorageNode.objects.filter(pk=pk).exists():
+            raise NotFound('Storage node not found')
+        return Response({'status': 'heartbeat received', 'updated': bool(updated)})
 
     @action(detail=True, methods=['get'])
     def chunks(self, request, pk=None):
-        """Get all chunks stored on this node."""
-        node = self.get_object()
-        chunks = Chunk.objects.filter(storage_node=node)
+        """Get the chunks stored on this node, paginated.
+
+        A hot node can hold millions of chunks; materializing them into
+        one JSON response is O(N) memory. Normal requests are paginated;
+        ?stream=1 returns newline-delimited JSON driven by iterator(), so
+        peak memory stays constant for full exports.
+        """
+        # Listing is read-only and already scoped by the pk in the URL, so
+        # skip get_object's extra SELECT and filter on the FK directly;
+        # permission_classes still guards access.
+        chunks = Chunk.objects.filter(
+            storage_node_id=_uuid_or_404(pk)
+        ).select_related('file', 'storage_node').order_by(
+            'file_id', 'chunk_number', 'id'
+        )
+
+        if request.query_params.get('stream') == '1':
+            def rows():
+                for chunk in chunks.iterator(chunk_size=2000):
+                    yield JSONRenderer().render(ChunkSerializer(chunk).data)
+                    yield b'\n'
+            return StreamingHttpResponse(
+                rows(), content_type='application/x-ndjson'
+            )
+
+        page = self.paginate_queryset(chunks)
+        if page is not None:
+            serializer = ChunkSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
         serializer = ChunkSerializer(chunks, many=True)
         return Response(serializer.data)
 
@@ -54,10 +189,17 @@ class FileViewSet(viewsets.ModelViewSet):
     serializer_class = FileSerializer
     parser_classes = (MultiPartParser, FormParser)
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FileCursorPagination
 
     def get_queryset(self):
         """Filter files by the current user."""
-        return self.queryset.filter(user=self.request.user)
+        # Project only the columns FileSerializer reads (head_checksum in
+        # particular is probe-only and never serialized).
+        return self.queryset.filter(user=self.request.user).only(
+            'id', 'name', 'size', 'checksum', 'content_type', 'user',
+            'chunk_count', 'is_deleted', 'deleted_at',
+            'created_at', 'updated_at',
+        )
 
     @transaction.atomic
     def create(self, request, *args, **kwargs):
@@ -67,45 +209,253 @@ class FileViewSet(viewsets.ModelViewSet):
         file_obj = request.FILES['file']
         chunk_size = serializer.validated_data['chunk_size']
         replication_factor = serializer.validated_data['replication_factor']
+        # Resolve the lazy request.user once; every later access would
+        # otherwise go through SimpleLazyObject.__getattr__.
+        user_id = request.user.pk
+
+        nodes = list(
+            StorageNode.objects.filter(is_active=True).order_by('-available')
+        )
+        if not nodes:
+            raise ServiceUnavailable('No active storage nodes available.')
 
-        # Calculate file checksum
-        sha256_hash = hashlib.sha256()
-        for chunk in file_obj.chunks(chunk_size=8192):
-            sha256_hash.update(chunk)
-        file_checksum = sha256_hash.hexdigest()
-
-        # Check if file already exists
-        existing_file = File.objects.filter(
-            checksum=file_checksum,
-            user=request.user
-        ).first()
-        
-        if existing_file:
+        # Probe (size, head digest) first: a re-upload of an existing file
+        # is caught after reading 1 MiB instead of after staging the whole
+        # payload. A head match is only a candidate, so the full checksum
+        # still decides.
+        file_obj.seek(0)
+        head = file_obj.read(_HEAD_PROBE_SIZE)
+        head_checksum = _hash_hex(head) if head else None
+        file_obj.seek(0)
+        if head_checksum and _HEAD_CHECKSUMS.might_contain(
+            head_checksum
+        ) and File.objects.filter(
+            user_id=user_id,
+            size=file_obj.size,
+            head_checksum=head_checksum,
+        ).exists():
+            file_hasher = _HASH_CTOR()
+            for data in file_obj.chunks(chunk_size=settings.STORAGE_HASH_BUF):
+                file_hasher.update(data)
+            existing_id = None
+            if _FILE_CHECKSUMS.might_contain(file_hasher.hexdigest()):
+                existing_id = File.objects.filter(
+                    checksum=file_hasher.hexdigest(),
+                    user_id=user_id
+                ).values_list('id', flat=True).first()
+            if existing_id:
+                return Response(
+                    {'error': 'File already exists',
+                     'file_id': str(existing_id)},
+                    status=status.HTTP_409_CONFLICT
+                )
+            file_obj.seek(0)
+
+        # Single fused pass over the upload: the same read feeds the
+        # whole-file digest, each chunk's digest (on the hash pool) and
+        # the staged storage write, so the bytes are only walked once.
+        file_id = uuid.uuid4()
+        file_hasher = _HASH_CTOR()
+        staged = []
+        batch = []
+        file_obj.seek(0)
+        # Split with an explicit read loop: InMemoryUploadedFile.chunks()
+        # ignores its chunk_size argument and yields the whole payload in
+        # one piece, which would collapse small uploads into a single
+        # chunk and make boundaries (and the merkle_root) depend on the
+        # upload transport instead of the validated chunk_size.
+        chunk_number = 0
+        while data := file_obj.read(chunk_size):
+            file_hasher.update(data)
+            batch.append(
+                (chunk_number, data, _HASH_POOL.submit(_hash_hex, data))
+            )
+            chunk_number += 1
+            if len(batch) >= _DEDUP_BATCH:
+                self._stage_batch(file_id, batch, staged)
+                batch = []
+        if batch:
+            self._stage_batch(file_id, batch, staged)
+        file_checksum = file_hasher.hexdigest()
+        # Merkle-style root over the ordered chunk digests. The Chunk rows
+        # are the level-0 hashes, so a verifier can recompute this from
+        # per-chunk digests alone, without re-reading the file bytes.
+        merkle_root = _hash_hex(
+            b''.join(
+                bytes.fromhex(digest)
+                for _, _, _, digest, _ in sorted(staged)
+            )
+        ) if staged else None
+
+        # Check if file already exists; only the id is needed for the 409
+        # body, so skip materializing the whole row, and a definite Bloom
+        # miss skips the query altogether.
+        existing_id = None
+        if _FILE_CHECKSUMS.might_contain(file_checksum):
+            existing_id = File.objects.filter(
+                checksum=file_checksum,
+                user_id=user_id
+            ).values_list('id', flat=True).first()
+
+        if existing_id:
+            self._discard_staged(staged)
             return Response(
-                {'error': 'File already exists', 'file_id': str(existing_file.id)},
+                {'error': 'File already exists', 'file_id': str(existing_id)},
                 status=status.HTTP_409_CONFLICT
             )
 
-        # Create file record
-        file_record = File.objects.create(
-            name=file_obj.name,
-            size=file_obj.size,
-            checksum=file_checksum,
-            content_type=file_obj.content_type,
-            user=request.user
-        )
+        # Create file record. The Bloom-gated probe above can miss a row
+        # another worker inserted since this process last rebuilt its
+        # filter, so the unique constraint is the real dedup authority:
+        # on conflict, discard the staged payloads and return the 409 the
+        # probe would have produced.
+        try:
+            with transaction.atomic():
+                file_record = File.objects.create(
+                    id=file_id,
+                    name=file_obj.name,
+                    size=file_obj.size,
+                    checksum=file_checksum,
+                    head_checksum=head_checksum,
+                    merkle_root=merkle_root,
+                    content_type=file_obj.content_type,
+                    user_id=user_id
+                )
+        except IntegrityError:
+            self._discard_staged(staged)
+            existing_id = File.objects.filter(
+                checksum=file_checksum,
+                user_id=user_id
+            ).values_list('id', flat=True).first()
+            _FILE_CHECKSUMS.add(file_checksum)
+            return Response(
+                {'error': 'File already exists',
+                 'file_id': str(existing_id) if existing_id else None},
+                status=status.HTTP_409_CONFLICT
+            )
+        _FILE_CHECKSUMS.add(file_checksum)
+        _HEAD_CHECKSUMS.add(head_checksum)
 
-        # TODO: Implement chunking and distribution logic
-        # 1. Split file into chunks
-        # 2. Find available storage nodes
-        # 3. Store chunks with replication
-        # 4. Create chunk records
+        self._create_chunk_records(
+            file_record, staged, nodes, replication_factor
+        )
 
+        # Every value is already in a local or on the fresh record, so
+        # build the 201 payload by hand instead of re-running
+        # FileSerializer's field iteration - but with the exact keys and
+        # representations the serializer produces, so upload clients see
+        # the same contract as list/detail.
         return Response(
-            FileSerializer(file_record).data,
+            {
+                'id': str(file_record.id),
+                'name': file_record.name,
+                'size': file_record.size,
+                'size_mb': (
+                    file_record.size / (1024 * 1024) if file_record.size else 0
+                ),
+                'checksum': file_checksum,
+                'content_type': file_record.content_type,
+                'file_type': file_record.file_type_cached,
+                'user': user_id,
+                'is_available': file_record.is_available,
+                'is_deleted': file_record.is_deleted,
+                'deleted_at': None,
+                'created_at': _ISO_DATETIME.to_representation(
+                    file_record.created_at
+                ),
+                'updated_at': _ISO_DATETIME.to_representation(
+                    file_record.updated_at
+                ),
+            },
             status=status.HTTP_201_CREATED
         )
 
+    def _stage_batch(self, file_id, batch, staged):
+        """Stage a batch of chunks, deduplicating against stored chunks.
+
+        Resolves the batch's digests, looks up which of them already have
+        bytes in the store with one checksum IN (...) query, and only
+        writes payloads that are genuinely new; duplicates reuse the
+        existing object_key.
+        """
+        digests = [future.result() for _, _, future in batch]
+        # Only digests the Bloom filter cannot rule out reach the IN
+        # query; a miss just means the chunk is stored as new.
+        candidates = [
+            digest for digest in set(digests)
+            if _CHUNK_CHECKSUMS.might_contain(digest)
+        ]
+        existing = dict(
+            Chunk.objects.filter(checksum__in=candidates)
+            .exclude(object_key='')
+            .values_list('checksum', 'object_key')
+        ) if candidates else {}
+        # Kick off the storage writes for genuinely new chunks on the I/O
+        # pool so they overlap each other and the next batch's reads.
+        pending = []
+        for (chunk_number, data, _), digest in zip(batch, digests):
+            object_key = existing.get(digest)
+            is_new = object_key is None
+            if is_new:
+                object_key = _IO_POOL.submit(
+                    default_storage.save,
+                    f'chunks/{file_id}/{chunk_number}', ContentFile(data)
+                )
+                # Also dedups repeated chunks within the same upload; a
+                # later duplicate may briefly reference the future.
+                existing[digest] = object_key
+            pending.append((chunk_number, len(data), digest, object_key, is_new))
+
+        for chunk_number, size, digest, object_key, is_new in pending:
+            if hasattr(object_key, 'result'):
+                object_key = object_key.result()
+                existing[digest] = object_key
+            staged.append((chunk_number, object_key, size, digest, is_new))
+
+    def _discard_staged(self, staged):
+        """Remove staged chunk payloads after a duplicate was detected."""
+        for _, object_key, _, _, is_new in staged:
+            if is_new:
+                default_storage.delete(object_key)
+
+    def _create_chunk_records(self, file_record, staged, nodes,
+                              replication_factor):
+        """Create the Chunk rows for a staged upload with replication.
+
+        Chunk rows are accumulated and written with a single bulk_create
+        per batch instead of one INSERT per chunk per replica, and the
+        file's denormalized chunk_count is bumped in one UPDATE.
+        """
+        replication_factor = min(replication_factor, len(nodes))
+
+        chunks = []
+        for chunk_number, object_key, size, chunk_checksum, _ in staged:
+            for replica in range(replication_factor):
+                node = nodes[(chunk_number + replica) % len(nodes)]
+                chunks.append(Chunk(
+                    file=file_record,
+                    storage_node=node,
+                    object_key=object_key,
+                    chunk_number=chunk_number,
+                    size=size,
+                    checksum=chunk_checksum,
+                    is_primary=(replica == 0),
+                    status=Chunk.ChunkStatus.COMPLETED,
+                ))
+
+        Chunk.objects.bulk_create(
+            chunks, batch_size=500, ignore_conflicts=True
+        )
+        for _, _, _, chunk_checksum, _ in staged:
+            _CHUNK_CHECKSUMS.add(chunk_checksum)
+        # bulk_create bypasses Chunk.save, so apply the counter bump here
+        # as a single UPDATE for the whole batch.
+        File.objects.filter(pk=file_record.pk).update(
+            chunk_count=F('chunk_count') + len(chunks)
+        )
+        file_record.chunk_count = len(chunks)
+        return chunks
+
     @action(detail=True, methods=['get'])
     def download(self, request, pk=None):
         """Download the file by combining its chunks."""
@@ -117,14 +467,22 @@ class FileViewSet(viewsets.ModelViewSet):
     def create_version(self, request, pk=None):
         """Create a new version of the file."""
         file_obj = self.get_object()
-        version = FileVersion.objects.create(
-            file=file_obj,
-            version_number=file_obj.versions.count() + 1,
-            size=file_obj.size,
-            checksum=file_obj.checksum,
-            created_by=request.user,
-            notes=request.data.get('notes', '')
-        )
+        with transaction.atomic():
+            # Lock the parent row so concurrent version creation cannot
+            # race to the same number; MAX()+1 (instead of COUNT()+1)
+            # also stays correct if versions are ever deleted.
+            File.objects.select_for_update().only('id').get(pk=file_obj.pk)
+            next_version = FileVersion.objects.filter(file=file_obj).aggregate(
+                current=Coalesce(Max('version_number'), 0)
+            )['current'] + 1
+            version = FileVersion.objects.create(
+                file=file_obj,
+                version_number=next_version,
+                size=file_obj.size,
+                checksum=file_obj.checksum,
+                created_by=request.user,
+                notes=request.data.get('notes', '')
+            )
         return Response(
             FileVersionSerializer(version).data,
             status=status.HTTP_201_CREATED
@@ -136,27 +494,39 @@ class ChunkViewSet(viewsets.ModelViewSet):
     """
     serializer_class = ChunkSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = ChunkCursorPagination
 
     def get_queryset(self):
         """Filter chunks by the current user's files."""
-        return Chunk.objects.filter(file__user=self.request.user)
+        # The joined rows only contribute their names to the serializer,
+        # so restrict the projection accordingly.
+        return Chunk.objects.filter(
+            file__user=self.request.user
+        ).select_related('file', 'storage_node').only(
+            'id', 'file__id', 'file__name',
+            'storage_node__id', 'storage_node__name',
+            'object_key', 'chunk_number', 'size', 'checksum', 'is_primary',
+            'status', 'stored_checksum', 'last_verified_at',
+            'created_at', 'updated_at',
+        )
 
     @action(detail=True, methods=['post'])
     def verify(self, request, pk=None):
         """Verify the integrity of a chunk."""
-        chunk = self.get_object()
-        calculated_checksum = self._calculate_checksum(chunk)
-        chunk.stored_checksum = calculated_checksum
-        chunk.last_verified_at = timezone.now()
-        chunk.save(update_fields=['stored_checksum', 'last_verified_at'])
-
-        is_valid = chunk.verify_checksum(calculated_checksum)
-        return Response({'valid': is_valid})
-
-    def _calculate_checksum(self, chunk):
-        """Calculate checksum for a chunk's content."""
-        # TODO: Implement actual chunk content checksum calculation
-        return chunk.checksum
+        # Fetch just the columns verification touches instead of going
+        # through get_object, whose queryset joins file and storage_node
+        # for the list/detail serializer.
+        chunk = get_object_or_404(
+            Chunk.objects.filter(file__user=request.user).only(
+                'id', 'object_key', 'checksum', 'status',
+                'stored_checksum', 'last_verified_at',
+            ),
+            pk=pk,
+        )
+        # Same batcher the verify_chunks management command uses; a single
+        # chunk is just a batch of one.
+        results = verify_chunks([chunk])
+        return Response({'valid': results[chunk.pk]})
 
 class FileVersionViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -167,11 +537,18 @@ class FileVersionViewSet(viewsets.ReadOnlyModelViewSet):
 
     def get_queryset(self):
         """Filter versions by the current user's files."""
-        return FileVersion.objects.filter(file__user=self.request.user)
+        return FileVersion.objects.filter(
+            file__user=self.request.user
+        ).select_related('file', 'created_by')
 
     @action(detail=True, methods=['post'])
     def restore(self, request, pk=None):
         """Restore a specific version of a file."""
         version = self.get_object()
-        file_obj = version.restore()
+        with transaction.atomic():
+            # Lock the parent File row so two concurrent restores (or a
+            # restore racing a version creation) serialize instead of
+            # losing one of the writes.
+            File.objects.select_for_update().only('id').get(pk=version.file_id)
+            file_obj = version.restore()
         return Response(FileSerializer(file_obj).data)
\ No newline at end of file